@@ -26,6 +26,7 @@
     - 07/07/22 (pjf): Ensure that termination() actually terminates interpreter.
     - 08/05/22 (pjf): Handle SIGINT and SIGTERM signals correctly.
     - 08/14/22 (pjf): Add delay between FileWatchdog restarts.
+    - 10/16/26 (agent): Create scratch directory in process with utils.mkdir().
 """
 
 import enum
@@ -62,8 +63,7 @@ def init():
     parameters.run.job_id = config.job_id()
 
     # make and cd to scratch directory
-    if not os.path.exists(parameters.run.work_dir):
-        subprocess.call(["mkdir", "--parents", parameters.run.work_dir])
+    utils.mkdir(parameters.run.work_dir, parents=True, exist_ok=True)
     os.chdir(parameters.run.work_dir)
 
     # invoke local init
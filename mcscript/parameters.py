@@ -21,6 +21,7 @@
   + 10/11/20 (pjf): Add num_workers to parameters.
   + 09/10/23 (mac): Support diagnostic environment variables MCSCRIPT_QSUBM_INVOCATION
     and MCSCRIPT_SUBMISSION_INVOCATION.
+  + 10/16/26 (agent): Look up environment through local reference in populate().
 """
 
 import os
@@ -70,34 +71,37 @@ class RunParameters(object):
         # environment information
         ################################################################
 
+        # environment lookups via local reference
+        env = os.environ
+
         # basic run information
-        self.name = os.environ["MCSCRIPT_RUN"]
-        self.run_mode = os.environ["MCSCRIPT_RUN_MODE"]
-        self.run_queue = os.environ["MCSCRIPT_RUN_QUEUE"]
-        self.batch_mode = (os.environ["MCSCRIPT_RUN_MODE"] == "batch")
-        self.launch_dir = os.environ["MCSCRIPT_LAUNCH_DIR"]
-        self.work_dir = os.environ["MCSCRIPT_WORK_DIR"]
-        self.host_name = os.environ["HOST"]
+        self.name = env["MCSCRIPT_RUN"]
+        self.run_mode = env["MCSCRIPT_RUN_MODE"]
+        self.run_queue = env["MCSCRIPT_RUN_QUEUE"]
+        self.batch_mode = (self.run_mode == "batch")
+        self.launch_dir = env["MCSCRIPT_LAUNCH_DIR"]
+        self.work_dir = env["MCSCRIPT_WORK_DIR"]
+        self.host_name = env["HOST"]
 
         # job details
-        self.job_file = os.environ["MCSCRIPT_JOB_FILE"]
-        self.wall_time_sec = int(os.environ["MCSCRIPT_WALL_SEC"])
-        self.num_workers = int(os.getenv("MCSCRIPT_WORKERS"))
+        self.job_file = env["MCSCRIPT_JOB_FILE"]
+        self.wall_time_sec = int(env["MCSCRIPT_WALL_SEC"])
+        self.num_workers = int(env.get("MCSCRIPT_WORKERS"))
 
         # environment definitions: executable install prefix
-        self.install_dir = os.environ["MCSCRIPT_INSTALL_HOME"]
+        self.install_dir = env["MCSCRIPT_INSTALL_HOME"]
 
         # environment definitions: serial run parameters
-        self.serial_threads = int(os.environ["MCSCRIPT_SERIAL_THREADS"])
+        self.serial_threads = int(env["MCSCRIPT_SERIAL_THREADS"])
 
         # environment definitions: hybrid run parameters
-        self.hybrid_nodes = int(os.environ["MCSCRIPT_HYBRID_NODES"])
-        self.hybrid_ranks = int(os.environ["MCSCRIPT_HYBRID_RANKS"])
-        self.hybrid_threads = int(os.environ["MCSCRIPT_HYBRID_THREADS"])
+        self.hybrid_nodes = int(env["MCSCRIPT_HYBRID_NODES"])
+        self.hybrid_ranks = int(env["MCSCRIPT_HYBRID_RANKS"])
+        self.hybrid_threads = int(env["MCSCRIPT_HYBRID_THREADS"])
 
         # environment definitions: diagnostic
-        self.qsubm_invocation = os.getenv("MCSCRIPT_QSUBM_INVOCATION")
-        self.submission_invocation = os.getenv("MCSCRIPT_SUBMISSION_INVOCATION")
+        self.qsubm_invocation = env.get("MCSCRIPT_QSUBM_INVOCATION")
+        self.submission_invocation = env.get("MCSCRIPT_SUBMISSION_INVOCATION")
 
         # generate local definitions
         #
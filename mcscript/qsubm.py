@@ -18,6 +18,10 @@
       > PATH. However, you can instead specify, e.g., a full, qualified filename
       > (i.e., including path).  See note on "Availability of Python" in INSTALL.md.
 
+      > MCSCRIPT_SUBMIT_FANOUT (optional) specifies the maximum number of
+      > concurrent submissions, if the local configuration requests repeated
+      > submission rather than using array jobs.  The default is 16.
+
     Language: Python 3
 
     M. A. Caprio
@@ -85,11 +89,23 @@
         - Ensure `MCSCRIPT_PYTHON` is always set.
         - Add quiet mode.
         - Cosmetic improvements to argument handling.
+    + 10/16/26 (agent):
+        - Remove unused import of shutil.
+        - Submit repetitions concurrently, with bounded fanout.
+        - Locate job file with single listing of each run home.
+        - Create launch directory and parents with single utils.mkdir().
+        - Defer import of task module until after --help and --edit handling.
+        - Regularize environment definitions with list comprehension.
+        - Use f-strings for environment definitions.
+        - Bind os.environ locally for user configuration lookups.
+        - Relay output of each concurrent submission as it completes.
+        - Look up PWD and EDITOR with user configuration.
+        - Validate MCSCRIPT_SUBMIT_FANOUT only when submitting repetitions.
 """
 
 import argparse
+import concurrent.futures
 import os
-import shutil
 import subprocess
 import sys
 import types
@@ -97,22 +113,25 @@ import types
 from . import (
     config,
     parameters,
-    task,
     utils,
 )
 
 def get_user_config():
     """Get user configuration from environment."""
     user_config = types.SimpleNamespace()
+    env = os.environ
 
-    user_config.install_home = utils.expand_path(os.environ.get("MCSCRIPT_INSTALL_HOME"))
-    user_config.run_home_list = utils.expand_path(os.environ.get("MCSCRIPT_RUN_HOME", ".").split(":"))
-    user_config.work_home = utils.expand_path(os.environ.get("MCSCRIPT_WORK_HOME"))
+    user_config.install_home = utils.expand_path(env.get("MCSCRIPT_INSTALL_HOME"))
+    user_config.run_home_list = utils.expand_path(env.get("MCSCRIPT_RUN_HOME", ".").split(":"))
+    user_config.work_home = utils.expand_path(env.get("MCSCRIPT_WORK_HOME"))
 
     # optional fields
-    user_config.launch_home = utils.expand_path(os.environ.get("MCSCRIPT_LAUNCH_HOME"))
-    user_config.python_executable = utils.expand_path(os.environ.get("MCSCRIPT_PYTHON"))
-    user_config.env_script = utils.expand_path(os.environ.get("MCSCRIPT_SOURCE"))
+    user_config.launch_home = utils.expand_path(env.get("MCSCRIPT_LAUNCH_HOME"))
+    user_config.python_executable = utils.expand_path(env.get("MCSCRIPT_PYTHON"))
+    user_config.env_script = utils.expand_path(env.get("MCSCRIPT_SOURCE"))
+    user_config.submit_fanout = env.get("MCSCRIPT_SUBMIT_FANOUT", "16")
+    user_config.here_dir = env.get("PWD")
+    user_config.editor = env.get("EDITOR", "vi")
     user_config.run_prefix = "run"
 
     return user_config
@@ -213,9 +232,12 @@ def main():
     ################################################################
 
     if args.here:
-        user_config.run_home_list = [os.environ["PWD"]]
-        user_config.work_home = os.environ["PWD"]
-        user_config.launch_home = os.environ["PWD"]
+        if not user_config.here_dir:
+            print("PWD not found in environment")
+            exit(1)
+        user_config.run_home_list = [user_config.here_dir]
+        user_config.work_home = user_config.here_dir
+        user_config.launch_home = user_config.here_dir
 
     if not user_config.run_home_list:
         print("MCSCRIPT_RUN_HOME not found in environment")
@@ -249,15 +271,19 @@ def main():
         print("Run:", run)
 
     # ...and process run file
+    #   Each run home is listed once, for all extensions.  The first
+    #   extension (in order of preference) with a match is taken.
     script_extensions = [".py", ".csh"]
+    job_file_matches = utils.search_many_in_subdirectories(
+        user_config.run_home_list, [run+extension for extension in script_extensions],
+        fail_on_not_found=False, verbose=False
+    )
     job_file = None
     for extension in script_extensions:
-        for run_home in user_config.run_home_list:
-            filename = os.path.join(run_home, run+extension)
-            if os.path.exists(filename):
-                job_file = filename
-                job_extension = extension
-                break
+        if job_file_matches[run+extension] is not None:
+            job_file = job_file_matches[run+extension]
+            job_extension = extension
+            break
     if not args.quiet:
         print("  Run homes:", user_config.run_home_list)  # useful to report now, in case job file missing
     if (job_file is None):
@@ -283,12 +309,12 @@ def main():
 
     # environment definitions: general run parameters
     environment_definitions = [
-        "MCSCRIPT_RUN={:s}".format(run),
-        "MCSCRIPT_JOB_FILE={:s}".format(job_file),
-        "MCSCRIPT_RUN_MODE={:s}".format(run_mode),
-        "MCSCRIPT_RUN_QUEUE={:s}".format(str(args.queue)),
-        "MCSCRIPT_WALL_SEC={:d}".format(wall_time_sec),
-        "MCSCRIPT_WORKERS={:d}".format(args.workers),
+        f"MCSCRIPT_RUN={run:s}",
+        f"MCSCRIPT_JOB_FILE={job_file:s}",
+        f"MCSCRIPT_RUN_MODE={run_mode:s}",
+        f"MCSCRIPT_RUN_QUEUE={args.queue!s:s}",
+        f"MCSCRIPT_WALL_SEC={wall_time_sec:d}",
+        f"MCSCRIPT_WORKERS={args.workers:d}",
     ]
     parameters.run.name = run
     parameters.run.job_file = job_file
@@ -296,22 +322,28 @@ def main():
 
     # environment definitions: serial run parameters
     environment_definitions += [
-        "MCSCRIPT_SERIAL_THREADS={:d}".format(args.serialthreads)
+        f"MCSCRIPT_SERIAL_THREADS={args.serialthreads:d}"
     ]
 
     # environment definitions: hybrid run parameters
     environment_definitions += [
-        "MCSCRIPT_HYBRID_NODES={:d}".format(args.nodes),
-        "MCSCRIPT_HYBRID_RANKS={:d}".format(args.ranks),
-        "MCSCRIPT_HYBRID_THREADS={:d}".format(args.threads),
+        f"MCSCRIPT_HYBRID_NODES={args.nodes:d}",
+        f"MCSCRIPT_HYBRID_RANKS={args.ranks:d}",
+        f"MCSCRIPT_HYBRID_THREADS={args.threads:d}",
     ]
 
 
-    # set multi-task run parameters
+    # edit mode -- hand off to editor
     if (args.edit):
-        editor = os.environ.get("EDITOR", "vi")
+        editor = user_config.editor
         os.execlp(editor, editor, job_file)
-    elif (args.toc):
+
+    # set multi-task run parameters
+    #
+    # Note: The task module (and the control module it pulls in) is only
+    # needed from here on, so it is not imported for --help or --edit.
+    from . import task
+    if (args.toc):
         task_mode = task.TaskMode.kTOC
     elif (args.unlock):
         task_mode = task.TaskMode.kUnlock
@@ -380,11 +412,6 @@ def main():
     parameters.run.work_dir = work_dir
 
     # set up run launch directory (for batch job output logging)
-    launch_dir_parent = os.path.join(user_config.launch_home, run)
-    if not os.path.exists(user_config.launch_home):
-        utils.mkdir(user_config.launch_home)
-    if not os.path.exists(launch_dir_parent):
-        utils.mkdir(launch_dir_parent)
     if args.archive:
         # archive mode
         # launch in archive directory rather than usual batch job output directory
@@ -395,8 +422,7 @@ def main():
     else:
         # standard run mode
         launch_dir = os.path.join(user_config.launch_home, run, "batch")
-    if not os.path.exists(launch_dir):
-        utils.mkdir(launch_dir)
+    utils.mkdir(launch_dir, parents=True, exist_ok=True)
     environment_definitions.append(f"MCSCRIPT_LAUNCH_DIR={launch_dir}")
     parameters.run.launch_dir = launch_dir
 
@@ -422,19 +448,25 @@ def main():
     #   defining an environment for local execution.  So doing this
     #   regularization simplifies further processing and ensures
     #   uniformity of the environment between batch and local runs.
-    for i in range(len(environment_definitions)):
-        if (not "=" in environment_definitions[i]):
-            environment_definitions[i] += "="
+    environment_definitions = [
+        entry if ("=" in entry) else entry+"="
+        for entry in environment_definitions
+    ]
     if not args.quiet:
         print()
         print("Vars:", ",".join(environment_definitions))
     # for local run
+    #
+    # Note: job_environ is deliberately os.environ itself, not a copy.  The
+    # cluster configuration's submission() reads these definitions back from
+    # os.environ (e.g., MCSCRIPT_PYTHON in slurm_nersc) and may add its own
+    # (e.g., MCSCRIPT_NODE_TYPE), and the diagnostic invocation variables
+    # below are also set in os.environ; all of these must reach the job.
     job_environ=os.environ
-    environment_keyvalues = [
-        tuple(entry.split("=", maxsplit=1))  # maxsplit is to support values which themselves contain an equals sign
+    job_environ.update(
+        entry.split("=", maxsplit=1)  # maxsplit is to support values which themselves contain an equals sign
         for entry in environment_definitions
-        ]
-    job_environ.update(dict(environment_keyvalues))
+    )
 
 
     ################################################################
@@ -463,7 +495,7 @@ def main():
             print(submission_input_string)
             print()
             print("-"*64)
-        for i in range(repetitions):
+        if (repetitions == 1):
             subprocess.run(
                 submission_args,
                 input=submission_input_string,
@@ -472,6 +504,41 @@ def main():
                 env=job_environ,
                 cwd=launch_dir
                 )
+        else:
+            # submit repetitions concurrently
+            #   Output of each submission is captured, and relayed as soon as
+            #   that submission completes, so that outputs are not interleaved.
+            def submit(i):
+                return subprocess.run(
+                    submission_args,
+                    input=submission_input_string,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,  #  to redirect via stdout
+                    env=job_environ,
+                    cwd=launch_dir,
+                    text=True
+                    )
+
+            try:
+                submit_fanout = int(user_config.submit_fanout)
+            except ValueError:
+                submit_fanout = 0
+            if (submit_fanout < 1):
+                print("MCSCRIPT_SUBMIT_FANOUT must be a positive integer")
+                sys.exit(1)
+            max_workers = min(submit_fanout, repetitions)
+            failures = 0
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(submit, i) for i in range(repetitions)]
+                for future in concurrent.futures.as_completed(futures):
+                    process = future.result()
+                    sys.stdout.write(process.stdout)
+                    sys.stdout.flush()
+                    if (process.returncode != 0):
+                        failures += 1
+            if (failures > 0):
+                print(f"{failures:d} of {repetitions:d} submissions failed.")
+                exit(1)
 
     # handle interactive run
     # Note: We call interpreter rather than trying to directly execute
@@ -103,17 +103,57 @@
         - Include list of pools in toc.
     + 12/15/22 (pjf): Add archive_handler_subarchives_hsi().
     + 06/06/23 (pjf): Fix archive filenames in archive_handler_subarchives*.
+    + 10/16/26 (agent):
+        - Write archive in archive_handler_generic() in process with tarfile,
+          through large copy buffers.
+        - Archive from hard-link snapshot in archive_handler_generic().
+        - Look up task statuses in set of flag directory contents, and list flag
+          directory once per seek_task() call.
+        - Write expanded and finalized lock file contents with single write.
+        - Create lock file atomically with O_EXCL in get_lock(), rather than
+          checking for clash after three-second wait.
+        - Precompute indices of tasks in pool for seek_task().
+        - Bind loop invariants locally in task_status_list(), task_toc(), and
+          seek_task().
+        - List flag directory once with os.scandir() in task_unlock().
+        - Use f-strings in task_toc(), and write table of contents with single
+          buffered write in write_toc().
+        - Write task output header with single write in do_task(), and add
+          MCSCRIPT_TASK_QUIET to suppress per-task headers in unredirected output.
+        - Append finalization to lock file through raw descriptor in
+          finalize_lock().
+        - Pipe compressed archive through pigz in _write_tar_archive(), when
+          available.
+        - Add table of contents to archive from memory in
+          archive_handler_generic(), when written by write_toc() in same process.
+        - Cache index_str() and task_flag_base() results.
+        - Drop verbose listing from tar archive calls, in favor of summary totals.
+        - Move or copy results in process in save_results_single() and
+          save_results_multi().
+        - Add incremental mode to archive_handler_generic(), based on manifest of
+          file modification times and sizes.
+        - Stage archive snapshot in unique temporary directory, and omit files
+          which vanish while staging.
+        - Replace stale archive lock in do_archive(), since get_lock() no longer
+          overwrites existing lock file.
+        - Write archive manifest only for incremental archives.
 """
 
+import bisect
 import datetime
 import enum
-import glob
 import os
 import random
+import shutil
 import sys
+import tarfile
+import tempfile
 import time
 import inspect
+import io
+import json
 import fnmatch
+import functools
 import subprocess
 import traceback
 import typing
@@ -178,6 +218,9 @@ output_dir:str = None
 results_dir:str = None
 archive_dir:str = None
 
+# table of contents text, as most recently written by write_toc()
+current_toc_text:str = None
+
 
 ################################################################
 # bookkeeping initialization
@@ -193,6 +236,7 @@ def task_read_env():
         MCSCRIPT_TASK_START_INDEX -- starting value for task index (or offset for job rank in epar mode)
         MCSCRIPT_TASK_COUNT_LIMIT -- flag to request generation of TOC file
         MCSCRIPT_TASK_REDIRECT -- flag to request diagnostic dump of output to terminal
+        MCSCRIPT_TASK_QUIET -- flag to suppress per-task headers in unredirected output
 
     Parameter fields:
         "mode"
@@ -201,6 +245,7 @@ def task_read_env():
         "start_index"
         "count_limit"
         "redirect"
+        "quiet"
 
     Returns:
         (dict): multi-task run parameters
@@ -214,6 +259,7 @@ def task_read_env():
     task_parameters["count_limit"] = int(os.environ.get("MCSCRIPT_TASK_COUNT_LIMIT",-1))
     task_parameters["start_index"] = int(os.environ.get("MCSCRIPT_TASK_START_INDEX",0))
     task_parameters["redirect"] = os.environ.get("MCSCRIPT_TASK_REDIRECT")=="True"
+    task_parameters["quiet"] = os.environ.get("MCSCRIPT_TASK_QUIET")=="True"
 
     return task_parameters
 
@@ -234,6 +280,56 @@ def make_task_dirs ():
 # generic result storage support
 ################################################################
 
+# in-process implementations of save commands
+#   (shutil.copy copies contents and mode, as for plain cp, using
+#   zero-copy system calls where available)
+k_save_functions = {
+    "mv": shutil.move,
+    "cp": shutil.copy,
+}
+
+def _save_files(command, source_file_list, target_directory_path=None, target_file_path=None):
+    """Move or copy files to results directory.
+
+    Files are moved or copied in process for the "mv" and "cp" commands, with
+    logging as for --verbose, and otherwise through external command.
+
+    Arguments:
+        command (str): type of save, "mv" or "cp" (or other command
+            accepting --verbose and --target-directory)
+        source_file_list (list of str): files to be saved
+        target_directory_path (str, optional): target directory
+        target_file_path (str, optional): target file path (for single file)
+
+    Raises:
+        mcscript.exception.ScriptError: if save fails
+    """
+    save_function = k_save_functions.get(command)
+    if save_function is None:
+        if target_file_path is not None:
+            control.call([command, "--verbose"] + source_file_list + [target_file_path])
+        else:
+            control.call(
+                [command, "--verbose", "--target-directory={}".format(target_directory_path)]
+                + source_file_list
+            )
+        return
+
+    for source_file_path in source_file_list:
+        if target_file_path is not None:
+            destination = target_file_path
+        else:
+            destination = os.path.join(target_directory_path, os.path.basename(source_file_path))
+        try:
+            save_function(source_file_path, destination)
+        except OSError as err:
+            print("{} {} failed: {}".format(command, source_file_path, err))
+            raise exception.ScriptError("failed to save {}".format(source_file_path)) from err
+        print("{}'{}' -> '{}'".format(
+            "renamed " if command == "mv" else "", source_file_path, destination
+        ))
+    sys.stdout.flush()
+
 def save_results_single(
     task,
     source_file_path,
@@ -265,14 +361,7 @@ def save_results_single(
         target_file_path = os.path.join(res_dir, os.path.basename(source_file_path))
 
     # move file to destination
-    control.call(
-        [
-            command,
-            "--verbose",
-            source_file_path,
-            target_file_path
-        ]
-    )
+    _save_files(command, [source_file_path], target_file_path=target_file_path)
 
 
 def save_results_multi(
@@ -309,20 +398,262 @@ def save_results_multi(
         return
 
     # move file to destination
-    control.call(
-        [
-            command,
-            "--verbose",
-            "--target-directory={}".format(target_directory_path)
-        ] + source_file_list
-    )
+    _save_files(command, source_file_list, target_directory_path=target_directory_path)
 
 
 ################################################################
 # generic archiving support
 ################################################################
 
-def archive_handler_generic(include_results=True):
+# copy buffer size (bytes) for in-process archive generation
+k_archive_buffer_size = 2**21
+
+# compression level for in-process archive generation (as for gzip/tar default)
+k_archive_compression_level = 6
+
+# pattern for files to exclude from archive
+k_archive_exclude_pattern = "task-ARCH-*"
+
+# parallel gzip compressor, used for compressed archives if found on PATH
+#   (else compression is done in process)
+k_archive_parallel_compressor = "pigz"
+
+def _compressor_threads():
+    """Get number of threads available for parallel compression.
+
+    Returns:
+        (int): number of threads
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def _stage_snapshot(source_dir, filename_list, stage_dir):
+    """Stage snapshot of files/directories by hard links.
+
+    The directory tree is recreated beneath the staging directory, with each
+    file hard linked to its original (symbolic links are recreated).  Since
+    hard links only duplicate metadata, this is cheap, and the staged
+    directories do not see files being subsequently created, removed, or
+    renamed (e.g., lock files becoming done files).  Note, however, that
+    modifications to the contents of an existing file remain visible through
+    the hard link.  Files which vanish (e.g., are renamed) between being listed
+    and being linked are omitted from the snapshot.
+
+    Arguments:
+        source_dir (str): directory relative to which filenames are given
+        filename_list (list of str): files/directories to stage
+        stage_dir (str): staging directory (must exist and be empty)
+
+    Raises:
+        OSError: if snapshot cannot be staged (e.g., hard links not supported)
+    """
+
+    def stage_entry(source, target):
+        try:
+            if os.path.islink(source):
+                os.symlink(os.readlink(source), target)
+            else:
+                os.link(source, target)
+        except FileNotFoundError:
+            # file vanished since directory was listed
+            pass
+
+    staged_directories = []
+    for filename in filename_list:
+        source = os.path.join(source_dir, filename)
+        target = os.path.join(stage_dir, filename)
+        if os.path.isdir(source) and not os.path.islink(source):
+            for (dirpath, dirnames, filenames) in os.walk(source):
+                target_dirpath = os.path.join(target, os.path.relpath(dirpath, source))
+                os.makedirs(target_dirpath, exist_ok=True)
+                staged_directories.append((dirpath, target_dirpath))
+                for name in filenames:
+                    stage_entry(os.path.join(dirpath, name), os.path.join(target_dirpath, name))
+                for name in dirnames:
+                    # os.walk does not descend into symbolic links to directories
+                    if os.path.islink(os.path.join(dirpath, name)):
+                        stage_entry(os.path.join(dirpath, name), os.path.join(target_dirpath, name))
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            stage_entry(source, target)
+
+    # restore directory metadata (e.g., modification times), deepest first
+    for (dirpath, target_dirpath) in reversed(staged_directories):
+        try:
+            shutil.copystat(dirpath, target_dirpath)
+        except FileNotFoundError:
+            pass
+
+def _write_tar_archive(
+        archive_filename, filename_list, compress=False, snapshot=False,
+        text_members=None, previous_manifest=None
+):
+    """Write tar archive of files/directories in run directory, in process.
+
+    This reproduces the effect of
+
+        tar [z]cf archive_filename --sort=name --transform=s,^,runxxxx/,
+            --exclude=task-ARCH-* filename_list
+
+    run from the run directory, but reads and writes through large copy buffers
+    and avoids launching tar as a subprocess.  If compression is requested and
+    the parallel compressor (pigz) is available, the tar stream is piped
+    through it, using all available threads; otherwise compression is done in
+    process.
+
+    Arguments:
+        archive_filename (str): archive filename
+        filename_list (list of str): files/directories to archive, relative
+            to run directory
+        compress (bool, optional): whether or not to gzip compress archive
+        snapshot (bool, optional): whether or not to archive from a snapshot
+            staged by hard links (see _stage_snapshot), so that the archive is
+            not affected by concurrent creation or renaming of files (e.g.,
+            flag files); falls back to archiving in place if the snapshot
+            cannot be staged
+        text_members (dict, optional): mapping from filename (relative to run
+            directory) to text, for members to be added from memory (ahead of
+            filename_list) rather than read from disk
+        previous_manifest (dict, optional): manifest from previous archive (as
+            returned by this function), for incremental archive; regular files
+            with unchanged modification time and size are omitted
+
+    Returns:
+        (dict): manifest mapping path of each regular file considered
+            (relative to run directory) to [mtime, size]
+
+    Raises:
+        mcscript.exception.ScriptError: if archive cannot be written
+    """
+
+    member_count = 0
+    manifest = {}
+
+    def exclude_filter(tarinfo):
+        nonlocal member_count
+        # avoid archiving archive phase's own (changing) output
+        if fnmatch.fnmatchcase(os.path.basename(tarinfo.name), k_archive_exclude_pattern):
+            return None
+        # record file in manifest, and skip if unchanged since previous archive
+        if tarinfo.isreg():
+            filename = os.path.relpath(tarinfo.name, parameters.run.name)
+            signature = [tarinfo.mtime, tarinfo.size]
+            manifest[filename] = signature
+            if (previous_manifest is not None) and (previous_manifest.get(filename) == signature):
+                return None
+        member_count += 1
+        return tarinfo
+
+    # log header output
+    print("----------------------------------------------------------------")
+    print("Generating archive {:s}".format(archive_filename))
+    print("Start time: {:s}".format(utils.time_stamp()))
+    print("Contents: {}".format(" ".join(
+        ([] if text_members is None else list(text_members)) + filename_list
+    )))
+    sys.stdout.flush()
+
+    # stage snapshot
+    start_time = time.time()
+    source_dir = parameters.run.work_dir
+    stage_dir = None
+    if (snapshot):
+        # Note: Staging directory name must be unique across all jobs sharing
+        # the archive directory, not just among processes on this node.
+        try:
+            stage_dir = tempfile.mkdtemp(
+                prefix=".stage-", dir=os.path.dirname(os.path.abspath(archive_filename))
+            )
+            _stage_snapshot(source_dir, filename_list, stage_dir)
+            source_dir = stage_dir
+        except OSError as err:
+            print("Snapshot staging failed ({}); archiving in place.".format(err))
+            if stage_dir is not None:
+                shutil.rmtree(stage_dir, ignore_errors=True)
+                stage_dir = None
+
+    # construct archive
+    #
+    # Note: Directory contents are added in sorted order, as for tar
+    # --sort=name.
+    def add_members(tar):
+        if (text_members is not None):
+            for (filename, text) in text_members.items():
+                data = text.encode()
+                tarinfo = tarfile.TarInfo(os.path.join(parameters.run.name, filename))
+                tarinfo.size = len(data)
+                tarinfo.mtime = time.time()
+                tarinfo.mode = 0o644
+                tarinfo.uid = os.getuid()
+                tarinfo.gid = os.getgid()
+                tar.addfile(tarinfo, io.BytesIO(data))
+        for filename in filename_list:
+            tar.add(
+                os.path.join(source_dir, filename),
+                arcname=os.path.join(parameters.run.name, filename),
+                filter=exclude_filter
+            )
+
+    compressor = None
+    if (compress and k_archive_parallel_compressor):
+        compressor = shutil.which(k_archive_parallel_compressor)
+    try:
+        with open(archive_filename, "wb", buffering=k_archive_buffer_size) as archive_stream:
+            if (compressor is not None):
+                # stream uncompressed tar through parallel compressor
+                compressor_invocation = [
+                    compressor,
+                    "-{:d}".format(k_archive_compression_level),
+                    "-p", str(_compressor_threads()),
+                ]
+                print("Compressing with: {}".format(" ".join(compressor_invocation)))
+                process = subprocess.Popen(
+                    compressor_invocation, stdin=subprocess.PIPE, stdout=archive_stream
+                )
+                try:
+                    with tarfile.open(
+                            fileobj=process.stdin, mode="w|", format=tarfile.GNU_FORMAT,
+                            bufsize=k_archive_buffer_size, copybufsize=k_archive_buffer_size
+                    ) as tar:
+                        add_members(tar)
+                finally:
+                    process.stdin.close()
+                    returncode = process.wait()
+                if (returncode != 0):
+                    raise OSError("{} returned {:d}".format(compressor, returncode))
+            else:
+                mode = "w:gz" if compress else "w"
+                compression_kwargs = {"compresslevel": k_archive_compression_level} if compress else {}
+                with tarfile.open(
+                        fileobj=archive_stream, mode=mode, format=tarfile.GNU_FORMAT,
+                        copybufsize=k_archive_buffer_size, **compression_kwargs
+                ) as tar:
+                    add_members(tar)
+    except (OSError, tarfile.TarError) as err:
+        print("Archive generation failed: {}".format(err))
+        if os.path.exists(archive_filename):
+            os.remove(archive_filename)
+        raise exception.ScriptError("archive generation failed") from err
+    finally:
+        if stage_dir is not None:
+            shutil.rmtree(stage_dir)
+    archive_time = time.time() - start_time
+
+    # finish logging
+    print("----------------")
+    print("Archived {:d} members ({:d} bytes)".format(
+        member_count + (0 if text_members is None else len(text_members)),
+        os.path.getsize(archive_filename)
+    ))
+    print("Wall time: {:.2f} sec (={:.2f} min)".format(archive_time, archive_time/60))
+    print("----------------------------------------------------------------")
+    sys.stdout.flush()
+
+    return manifest
+
+def archive_handler_generic(include_results=True, incremental=False):
     """Make archive of all metadata and results directories,
     to the run's archive directory.
 
@@ -339,6 +670,20 @@ def archive_handler_generic(include_results=True):
     The paths for the files in the archive are of the form runxxxx/results/*,
     etc.
 
+    For an incremental archive, a manifest of the files archived (with their
+    modification times and sizes) is kept in the archive directory, and only
+    files which are new or changed since the last incremental archive are
+    included.  The first incremental archive (with no manifest yet) includes
+    all files, and serves as the baseline.  Full archives neither read nor
+    write the manifest.  Incremental archive filenames carry a time stamp, so
+    successive incremental archives on the same day are retained.
+
+    Arguments:
+        include_results (bool, optional): whether or not to include results
+            directory
+        incremental (bool, optional): whether or not to make incremental
+            archive
+
     Returns:
         (str): archive filename (for convenience of calling function if
             wrapped in larger task handler)
@@ -373,6 +718,11 @@ def archive_handler_generic(include_results=True):
     #
     # Ah, robust solution is simply to exclude files "task-ARCH-*" from
     # the tar archive.
+    #
+    # The archive is now written in process by _write_tar_archive(), which
+    # retains the exclusion of "task-ARCH-*" files, and moreover archives
+    # from a hard-link snapshot, so that flag files appearing or being
+    # renamed during archiving do not affect the archive.
 
 
     # make archive -- whole dir
@@ -380,31 +730,52 @@ def archive_handler_generic(include_results=True):
         mode_flag = ""
     else:
         mode_flag = "-nores"
+    if (incremental):
+        archive_tag = "{:s}-incr".format(time.strftime("%y%m%d-%H%M%S"))
+    else:
+        archive_tag = utils.date_tag()
     archive_filename = os.path.join(
         archive_dir,
-        "{:s}-archive-{:s}{:s}.tgz".format(parameters.run.name,utils.date_tag(),mode_flag)
+        "{:s}-archive-{:s}{:s}.tgz".format(parameters.run.name,archive_tag,mode_flag)
         )
     toc_filename = "{}.toc".format(parameters.run.name)
     filename_list = [
-        toc_filename,
         "flags",
         "output",
         "batch"
     ]
     if (include_results):
         filename_list += ["results"]
-    control.call(
-        [
-            "tar",
-            "zcvf",
-            archive_filename,
-            "--sort=name",
-            "--transform=s,^,{:s}/,".format(parameters.run.name),  # prepend run name as directory
-            "--show-transformed",
-            "--exclude=task-ARCH-*"   # avoid failure return code due to "tar: runxxxx/output/task-ARCH-0.out: file changed as we read it"
-        ] + filename_list,
-        cwd=parameters.run.work_dir, check_return=True
-        )
+    # take toc from memory if generated by this process, else from file
+    if (current_toc_text is not None):
+        text_members = {toc_filename: current_toc_text}
+    else:
+        filename_list.insert(0, toc_filename)
+        text_members = None
+
+    # retrieve manifest of previous archive
+    manifest_filename = os.path.join(
+        archive_dir,
+        "{:s}-archive{:s}-manifest.json".format(parameters.run.name,mode_flag)
+    )
+    previous_manifest = None
+    if (incremental):
+        try:
+            with open(manifest_filename) as manifest_stream:
+                previous_manifest = json.load(manifest_stream)
+        except FileNotFoundError:
+            pass
+
+    manifest = _write_tar_archive(
+        archive_filename, filename_list, compress=True, snapshot=True,
+        text_members=text_members, previous_manifest=previous_manifest
+    )
+
+    # save manifest atomically, for subsequent incremental archive
+    if (incremental):
+        with open(manifest_filename+".tmp", "w") as manifest_stream:
+            json.dump(manifest, manifest_stream)
+        os.replace(manifest_filename+".tmp", manifest_filename)
 
     return archive_filename
 
@@ -464,11 +835,11 @@ def archive_handler_automagic(include_results=True):
         control.call(
             [
                 "tar",
-                "cvf",
+                "cf",
                 archive_filename,
                 "--sort=name",
                 "--transform=s,^,{:s}/,".format(parameters.run.name),  # prepend run name as directory
-                "--show-transformed",
+                "--totals",
                 "--exclude=task-ARCH-*"   # avoid failure return code due to "tar: runxxxx/output/task-ARCH-0.out: file changed as we read it"
             ] + filename_list,
             cwd=parameters.run.work_dir, check_return=True
@@ -567,7 +938,7 @@ def archive_handler_subarchives(archive_parameters_list):
         if (include_metadata):
             filename_list += ["flags","output","batch"]
         filename_list += available_paths
-        tar_flags = "zcvf" if compress else "cvf"
+        tar_flags = "zcf" if compress else "cf"
         control.call(
             [
                 "tar",
@@ -575,7 +946,7 @@ def archive_handler_subarchives(archive_parameters_list):
                 archive_filename,
                 "--sort=name",
                 "--transform=s,^,{:s}/,".format(parameters.run.name),  # prepend run name as directory
-                "--show-transformed",
+                "--totals",
                 "--exclude=task-ARCH-*"   # avoid failure return code due to "tar: runxxxx/output/task-ARCH-0.out: file changed as we read it"
             ] + filename_list,
             cwd=parameters.run.work_dir, check_return=True
@@ -745,7 +1116,7 @@ def archive_handler_subarchives_hsi(archive_parameters_list, max_size=2**41, seg
         if (include_metadata):
             filename_list += ["flags","output","batch"]
         filename_list += available_paths
-        tar_flags = "zcvf" if compress else "cvf"
+        tar_flags = "zcf" if compress else "cf"
         try:
             control.call(
                 [
@@ -754,7 +1125,7 @@ def archive_handler_subarchives_hsi(archive_parameters_list, max_size=2**41, seg
                     archive_filename,
                     "--sort=name",
                     "--transform=s,^,{:s}/,".format(parameters.run.name),  # prepend run name as directory
-                    "--show-transformed",
+                    "--totals",
                     "--exclude=task-ARCH-*"   # avoid failure return code due to "tar: runxxxx/output/task-ARCH-0.out: file changed as we read it"
                 ] + filename_list,
                 cwd=parameters.run.work_dir, check_return=True
@@ -786,6 +1157,7 @@ def archive_handler_subarchives_hsi(archive_parameters_list, max_size=2**41, seg
 # recall functions
 ################################################################
 
+@functools.lru_cache(maxsize=None, typed=True)
 def index_str(task_index):
     """ Format a task index as %04d, or pass through other strings
     for special purposes (e.g., ARCH).
@@ -802,6 +1174,14 @@ def index_str(task_index):
     else:
         return str(task_index)
 
+def flag_dir_contents():
+    """Get contents of flag directory, for status lookup by task_status().
+
+    Returns:
+        (set of str): names of files in flag directory
+    """
+    return set(os.listdir(flag_dir))
+
 def task_status_list(task_list,phase_handlers):
     """Look up task status for all tasks in list.
 
@@ -816,16 +1196,17 @@ def task_status_list(task_list,phase_handlers):
     task_statuses:list[tuple[TaskStatus]] = []
 
     # get flag directory contents
-    flag_dir_list = os.listdir(flag_dir)
+    flag_dir_list = flag_dir_contents()
+    task_phases = range(len(phase_handlers))
     for task_index,task in enumerate(task_list):
         # retrieve task properties
         task_masks = task["metadata"]["masks"]
 
         # append tuple of phase statuses
-        task_statuses += [tuple(
+        task_statuses.append(tuple(
             task_status(task_index,task_phase,task_masks,flag_dir_list)
-            for task_phase in range(len(phase_handlers))
-        )]
+            for task_phase in task_phases
+        ))
 
     return task_statuses
 
@@ -843,39 +1224,45 @@ def task_toc(task_list,task_statuses,phase_handlers,color=False):
     """
 
     lines = [
-        "Run: {:s}".format(parameters.run.name),
-        "{:s}".format(time.asctime()),
-        "Phases: {:d}".format(len(phase_handlers))
+        f"Run: {parameters.run.name:s}",
+        time.asctime(),
+        f"Phases: {len(phase_handlers):d}",
         ]
 
     for task_phase in range(len(phase_handlers)):
         # retrieve phase handler docstring
         phase_docstring = inspect.getdoc(phase_handlers[task_phase])
-        phase_summary = "{}".format(phase_docstring).splitlines()[0]
-        lines.append("  Phase {:d} summary: {:s}".format(task_phase, phase_summary))
+        phase_summary = f"{phase_docstring}".splitlines()[0]
+        lines.append(f"  Phase {task_phase:d} summary: {phase_summary:s}")
 
     pool_list = {task["metadata"]["pool"]: None for task in task_list if task["metadata"]["pool"]}.keys()
-    lines.append("Pools: {:d}".format(len(pool_list)))
+    lines.append(f"Pools: {len(pool_list):d}")
     lines.append(" ")
     for task_pool in pool_list:
         if len(lines[-1])+len(task_pool)+1 >= 80:  # wrap lines at 80 columns
             lines.append(" ")
         lines[-1] += " " + task_pool
 
-    lines.append("Tasks: {:d}".format(len(task_list)))
+    lines.append(f"Tasks: {len(task_list):d}")
+
+    # bind loop invariants locally
+    append_line = lines.append
+    spacify = utils.spacify
+    status_color_codes = k_task_status_color_codes
     for task_index,task in enumerate(task_list):
 
         # retrieve task properties
-        task_pool = task["metadata"]["pool"]
-        task_descriptor = task["metadata"]["descriptor"]
-        task_masks = task["metadata"]["masks"]
+        task_metadata = task["metadata"]
+        task_pool = task_metadata["pool"]
+        task_descriptor = task_metadata["descriptor"]
+        task_masks = task_metadata["masks"]
 
         # assemble line
         fields = [index_str(task_index), task_pool]
         if color:
             fields += [
                 (
-                    k_task_status_color_codes[status]
+                    status_color_codes[status]
                     + (status.value if mask else status.value.lower())
                     + k_reset_color_code
                 )
@@ -889,7 +1276,7 @@ def task_toc(task_list,task_statuses,phase_handlers,color=False):
         fields += [task_descriptor]
 
         # accumulate line
-        lines.append(utils.spacify(fields))
+        append_line(spacify(fields))
 
     return "\n".join(lines)
 
@@ -897,15 +1284,29 @@ def task_unlock(lock_types=(TaskStatus.kLocked,TaskStatus.kFailed)):
     """ Remove all lock and fail flags.
     """
 
+    # scan flag directory once for both flag types
+    lock_files = []
+    fail_files = []
+    with os.scandir(flag_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.startswith("task"):
+                continue
+            if name.endswith(".lock"):
+                lock_files.append(entry.path)
+            elif name.endswith(".fail"):
+                fail_files.append(entry.path)
+
     flag_files = []
     if TaskStatus.kLocked in lock_types:
-        flag_files += glob.glob(os.path.join(flag_dir,"task*.lock"))
+        flag_files += lock_files
     if TaskStatus.kFailed in lock_types:
-        flag_files += glob.glob(os.path.join(flag_dir,"task*.fail"))
+        flag_files += fail_files
     print("Removing lock/fail files:", flag_files)
     for flag_file in flag_files:
         os.remove(flag_file)
 
+@functools.lru_cache(maxsize=None, typed=True)
 def task_flag_base(task_index,phase):
     """Generate flag file basename for the given phase of the given task.
 
@@ -932,7 +1333,9 @@ def task_output_filename(task_index,phase):
 
     """
 
-    return os.path.join(output_dir,"task-{:s}-{:d}.out".format(index_str(task_index),phase))
+    # Note: Only the basename is cached (via task_flag_base), since output_dir
+    # is a module global which may be reset.
+    return os.path.join(output_dir,task_flag_base(task_index,phase)+".out")
 
 def task_status(task_index,task_phase,task_masks,flag_dir_list=None):
     """ Generate status flag for the given phase of the given task.
@@ -948,7 +1351,9 @@ def task_status(task_index,task_phase,task_masks,flag_dir_list=None):
         task_index (int or str): task index
         task_phase (int): task phase
         task_masks (tuple of bool): mask flags for task phases
-        flag_dir_list (list of str): directory listing for flag directory
+        flag_dir_list (set or list of str, optional): directory listing for
+            flag directory (a set, as from flag_dir_contents(), for fast lookup);
+            if omitted, flag files are checked individually
 
     Returns:
         (TaskStatus): status flag
@@ -989,6 +1394,9 @@ def task_status(task_index,task_phase,task_masks,flag_dir_list=None):
 def get_lock(task_index, task_phase, task_descriptor):
     """ Write lock file for given task and given phase.
 
+    The lock file is created atomically, and the lock is not obtained if the
+    lock file already exists.
+
     Arguments:
         task_index (int or str): task index
         task_phase (int): task phase
@@ -1001,43 +1409,38 @@ def get_lock(task_index, task_phase, task_descriptor):
 
     flag_base = os.path.join(flag_dir, task_flag_base(task_index,task_phase))
 
-    # preliminary lock
+    # create lock file atomically
+    #
+    # Creation with O_EXCL fails if the lock file already exists, so a locking
+    # clash is detected immediately.  Such clashes primarily arise in batch
+    # mode, either when batch jobs start simultaneously or, less frequently,
+    # when concurrent batch jobs reach for their next task at the same time
+    # (although it could happen in interactive mode if two runs are being done
+    # simultaneously, e.g., from different terminal windows).  This replaces
+    # the former protocol of writing the lock file, waiting, and reading it
+    # back to check that it had not been overwritten.
     lock_string = "{} {:08x}".format(parameters.run.job_id, random.randrange(2**32))
-    lock_stream = open(flag_base+".lock", "w")
-    lock_stream.write(lock_string)  # omit newline since will do string comparison below
-    lock_stream.close()
-    # make sure lock was successful
-    if (parameters.run.batch_mode):
-        # primarily need to worry about locking clash in batch mode, either when
-        # batch jobs start simultaneously or, less frequently, when concurrent
-        # batch jobs reach for their next task at the same time (although it
-        # could happen in interactive mode if two runs are being done
-        # simultaneously, e.g., from different terminal windows)
-        wait_time = 3
-        time.sleep(wait_time)
-        lock_stream = open(flag_base+".lock", "r")
-        line = lock_stream.readline()
-        lock_stream.close()
-        if (line == lock_string):
-            print("Lock was apparently successful...")
-        else:
-            print("Locking clash: Current job is {} but lock file is from {}.  Yielding lock.".format(parameters.run.job_id,line))
-            ## raise exception.ScriptError("Yielding lock to other instance")
-            return (False,False)
-
-    # write expanded lock contents
-    lock_stream = open(flag_base+".lock","a")
-    lock_stream.write("\n".format(flag_base))  # add newline after job id
-    lock_stream.write("{}\n".format(flag_base))
-    lock_stream.write("{}\n".format(task_descriptor))
-    lock_stream.write("{}\n".format(time.asctime()))
-    lock_stream.close()
+    try:
+        lock_fd = os.open(flag_base+".lock", os.O_WRONLY|os.O_CREAT|os.O_EXCL, 0o666)
+    except FileExistsError:
+        try:
+            with open(flag_base+".lock", "r") as lock_stream:
+                line = lock_stream.readline().rstrip("\n")
+        except OSError:
+            line = None
+        print("Locking clash: Current job is {} but lock file is from {}.  Yielding lock.".format(parameters.run.job_id,line))
+        return (False,False)
+
+    # write lock contents
+    with os.fdopen(lock_fd, "w") as lock_stream:
+        lock_stream.write(f"{lock_string}\n{flag_base}\n{task_descriptor}\n{time.asctime()}\n")
 
     # remove any prior incomplete flag
-    resumed = False
-    if os.path.exists(flag_base+".incp"):
+    try:
         os.remove(flag_base+".incp")
         resumed = True
+    except FileNotFoundError:
+        resumed = False
 
     return (True,resumed)
 
@@ -1077,10 +1480,13 @@ def finalize_lock(task_index,task_phase,task_time):
     flag_base = os.path.join(flag_dir, task_flag_base(task_index,task_phase))
 
     # augment lock file
-    lock_stream = open(flag_base+".lock","a")
-    lock_stream.write("{}\n".format(time.asctime()))
-    lock_stream.write("{:.2f}\n".format(task_time))
-    lock_stream.close()
+    #   via raw descriptor, to avoid overhead of setting up buffered stream
+    #   for single short write
+    lock_fd = os.open(flag_base+".lock", os.O_WRONLY|os.O_APPEND)
+    try:
+        os.write(lock_fd, f"{time.asctime()}\n{task_time:.2f}\n".encode())
+    finally:
+        os.close(lock_fd)
 
     # move lock file to done file
     os.rename(flag_base+".lock",flag_base+".done")
@@ -1100,14 +1506,19 @@ def write_toc(task_list,task_statuses,phase_handlers):
 
     Returns:
         (str): toc filename, sans path (as convenience to caller)
+
+    Globals:
+        current_toc_text (str): set to toc file contents (for reuse by
+            archive_handler_generic)
     """
+    global current_toc_text
 
     # write current toc
-    toc_filename = "{}.toc".format(parameters.run.name)
-    toc_stream = open(toc_filename, "w")
-    toc_stream.write(task_toc(task_list,task_statuses,phase_handlers,color=False))
-    toc_stream.write("\n")
-    toc_stream.close()
+    toc_filename = f"{parameters.run.name}.toc"
+    toc_text = task_toc(task_list,task_statuses,phase_handlers,color=False) + "\n"
+    current_toc_text = toc_text
+    with open(toc_filename, "w", buffering=utils.k_write_buffer_size) as toc_stream:
+        toc_stream.write(toc_text)
 
     # return filename
     return toc_filename
@@ -1130,7 +1541,21 @@ def do_archive(task_parameters,archive_phase_handlers):
     # different archive phases can cause trouble with tar archiving,
     # if tar senses lock file appearing or disappearing during
     # archiving of flags directory -- results in exit with failure code
-    get_lock(task_index,task_phase,task_descriptor)
+    #
+    # Note: The archive phase is invoked explicitly, so any existing archive
+    # lock file is taken to be stale (e.g., left by an archive run which
+    # crashed) and is replaced, rather than yielded to.
+    (success, _) = get_lock(task_index,task_phase,task_descriptor)
+    if (not success):
+        print("Replacing stale archive lock.")
+        lock_filename = os.path.join(flag_dir, task_flag_base(task_index,task_phase)+".lock")
+        try:
+            os.remove(lock_filename)
+        except FileNotFoundError:
+            pass
+        (success, _) = get_lock(task_index,task_phase,task_descriptor)
+        if (not success):
+            raise exception.LockContention(task_index, task_phase)
 
     # initiate timing
     task_start_time = time.time()
@@ -1191,6 +1616,34 @@ def match_pool(pool, patterns):
     # no pattern matched
     return False
 
+# cached pool task indices, as (task_list, task_pool, indices)
+_pool_task_indices_cache = (None, None, None)
+
+def pool_task_indices(task_list,task_pool):
+    """Get indices of tasks matched by pool.
+
+    The result is cached for the most recent task list and pool, since
+    seek_task() is called repeatedly for the same ones.
+
+    Arguments:
+        task_list (dict): dictionary of tasks
+        task_pool (str): pool to consider (or "ALL")
+
+    Returns:
+       (list of int): ascending indices of tasks in pool
+    """
+    global _pool_task_indices_cache
+
+    (cached_task_list, cached_task_pool, indices) = _pool_task_indices_cache
+    if (cached_task_list is not task_list) or (cached_task_pool != task_pool):
+        indices = [
+            task_index
+            for (task_index, task) in enumerate(task_list)
+            if match_pool(task["metadata"]["pool"], task_pool)
+        ]
+        _pool_task_indices_cache = (task_list, task_pool, indices)
+    return indices
+
 def seek_task(task_list,task_pool,task_phase,prior_task_index):
     """Seek next available task, at given phase, in given pool.
 
@@ -1205,20 +1658,25 @@ def seek_task(task_list,task_pool,task_phase,prior_task_index):
 
     """
 
-    next_index = None
-    for task_index in range(prior_task_index+1, len(task_list)):
-        # skip if task not matched by pool
-        if not match_pool(task_list[task_index]["metadata"]["pool"], task_pool):
-            continue
+    # get flag directory contents once, rather than checking for each flag file
+    # of each candidate task
+    flag_dir_list = flag_dir_contents()
+
+    # consider only tasks matched by pool, after prior task
+    indices = pool_task_indices(task_list, task_pool)
+    start = bisect.bisect_right(indices, prior_task_index)
 
+    runnable_statuses = (TaskStatus.kPending, TaskStatus.kIncomplete)
+    next_index = None
+    for task_index in indices[start:]:
         # skip if task locked or done
         task_masks = task_list[task_index]["metadata"]["masks"]
-        if task_status(task_index, task_phase, task_masks) not in (TaskStatus.kPending, TaskStatus.kIncomplete):
+        if task_status(task_index, task_phase, task_masks, flag_dir_list) not in runnable_statuses:
             continue
 
         # skip if prior phase not completed
         if (task_phase > 0):
-            if task_status(task_index, task_phase-1, task_masks) != TaskStatus.kDone:
+            if task_status(task_index, task_phase-1, task_masks, flag_dir_list) != TaskStatus.kDone:
                 print("Missing prerequisite", task_flag_base(task_index, task_phase-1))
                 continue
 
@@ -1287,14 +1745,18 @@ def do_task(task_parameters,task,phase_handlers):
 
     # generate header for task output file
     if (task_mode != TaskMode.kPrerun):
-        print(64*"-")
-        print("task {} phase {}{}".format(task_index,task_phase," (resumed)" if resumed else ""))
-        print(task["metadata"]["descriptor"])
-        print(64*"-")
-        print(parameters.run.run_data_string())
-        print(utils.time_stamp())
-        print(64*"-")
-        print()
+        rule = 64*"-"
+        resumed_str = " (resumed)" if resumed else ""
+        sys.stdout.write(
+            f"{rule}\n"
+            f"task {task_index} phase {task_phase}{resumed_str}\n"
+            f"{task_descriptor}\n"
+            f"{rule}\n"
+            f"{parameters.run.run_data_string()}\n"
+            f"{utils.time_stamp()}\n"
+            f"{rule}\n"
+            "\n"
+        )
         sys.stdout.flush()
 
     # invoke task handler
@@ -1359,6 +1821,7 @@ def invoke_tasks_prerun(task_parameters,task_list,phase_handlers):
     task_phase = task_parameters["phase"]
     task_start_index = task_parameters["start_index"]
     task_count_limit = task_parameters["count_limit"]
+    task_quiet = task_parameters.get("quiet", False)
 
     task_index = -1  # "last run task" for seeking purposes
     while (True):
@@ -1371,8 +1834,9 @@ def invoke_tasks_prerun(task_parameters,task_list,phase_handlers):
 
         # display diagnostic header for task
         #     this goes to global (unredirected) output
-        print("[task {} phase {} {}]".format(task_index,task_phase,task["metadata"]["descriptor"]))
-        sys.stdout.flush()
+        if not task_quiet:
+            print("[task {} phase {} {}]".format(task_index,task_phase,task["metadata"]["descriptor"]))
+            sys.stdout.flush()
 
         # execute task
         do_task(task_parameters,task,phase_handlers)
@@ -1394,6 +1858,7 @@ def invoke_tasks_run(task_parameters,task_list,phase_handlers):
     task_phase = task_parameters["phase"]
     task_start_index = task_parameters["start_index"]
     task_count_limit = task_parameters["count_limit"]
+    task_quiet = task_parameters.get("quiet", False)
 
     # epar diagnostics
     ## if (parameters.run.parallel_epar != -1):
@@ -1438,8 +1903,9 @@ def invoke_tasks_run(task_parameters,task_list,phase_handlers):
 
         # display diagnostic header for task
         #     this goes to global (unredirected) output
-        print("[task {} phase {} {}]".format(task_index,task_phase,task["metadata"]["descriptor"]))
-        sys.stdout.flush()
+        if not task_quiet:
+            print("[task {} phase {} {}]".format(task_index,task_phase,task["metadata"]["descriptor"]))
+            sys.stdout.flush()
 
         # execute task
         task_time = 0
@@ -52,13 +52,62 @@
     06/29/22 (pjf): Generalize search_in_subdirectories for multiple filenames.
     12/15/22 (pjf): Add get_directory_size().
     01/19/24 (pjf): Make expand_path() handle None gracefully.
+    10/16/26 (agent):
+        + Hoist namelist formatters to module scope and dispatch with single
+          dictionary lookup.
+        + Precompile ANSI escape sequence regex in scrub_ansi().
+        + Compute value_range() and log_range() entries in closed form, rather
+          than by accumulation.
+        + Compress sample in is_compressible() with single zlib call.
+        + Read sample blocks in is_compressible() with positioned reads.
+        + Rewrite topological_sort() as iterative depth-first traversal.
+        + Create directories in mkdir() with os.makedirs() instead of mkdir
+          subprocess, unless MCSCRIPT_LEGACY_MKDIR is set.
+        + Prune nonexistent directories in search_in_subdirectories(), and
+          match filename roots against a single directory listing.
+        + Merge CoefficientDict sums and differences in single pass.
+        + Construct CoefficientDict scalar products in bulk.
+        + Build string list for stringify() by list comprehension.
+        + Accumulate TaskTimer statistics incrementally.
+        + Derive CoefficientDict from dict rather than collections.UserDict.
+        + Factor out _write_text_file() as common back end for write_input() and
+          write_namelist().
+        + Simplify TaskTimer.required_time() to single scaling of larger of
+          average and last times.
+        + Accept tuples as arrays in write_namelist(), and format lines with
+          f-strings.
+        + Write text files within context manager, through enlarged buffer.
+        + Create directory in mkdir() without prior existence check, falling
+          back to mkdir subprocess on I/O error.
+        + Test for multiple candidate filenames in search_in_subdirectories()
+          against cached directory listings.
+        + Merge dictionaries in dict_union() with in-place merge operator.
+        + Evaluate approx_less() and approx_gtr() directly, rather than through
+          nested predicate call.
+        + Join list or tuple of strings directly in stringify(), before falling
+          back on conversion of entries.
+        + Reuse formatted time stamp within same second in time_stamp().
+        + Hoist bound dictionary methods out of CoefficientDict accumulation loops.
+        + Test CoefficientDict coefficients and scalars against built-in numeric
+          types before numbers.Number.
+        + Format namelist booleans with conditional expression rather than ifelse().
+        + Look up namelist formatter once for homogeneous arrays.
+        + Only normalize paths without variables or ~ in expand_path().
+        + Accept subclasses of supported types (and str subclasses as variable
+          names) in write_namelist().
+        + Bind namelist formatter lookup locally in write_namelist().
+        + Add search_many_in_subdirectories() to locate several files with a single
+          pass over candidate directories.
+        + Emit search diagnostic output in single write per block.
+        + Enforce coefficient checks in CoefficientDict merge operators.
+        + Assemble namelist text before opening file in write_namelist().
+        + Ignore rejection of readahead advice in is_compressible().
 """
 
 import collections
-import glob
+import errno
 import math
 import numbers
-import itertools
 import os
 import re
 import subprocess
@@ -71,6 +120,41 @@ from . import exception
 # input file generation
 ################################################################
 
+# formatters for Fortran namelist values, keyed by exact type
+k_namelist_formatters = {
+    int:   (lambda n: "{:d}".format(n)),
+    float: (lambda x: "{:e}".format(x).replace("e", "d")),
+    bool:  (lambda b: ".true." if b else ".false."),
+    str:   (lambda s: "'{:s}'".format(s)),
+}
+
+# buffer size (bytes) for generated text files
+k_write_buffer_size = 1 << 17
+
+def _write_text_file(filename, text, verbose):
+    """Write fully-assembled text to file, with optional diagnostic output.
+
+    Shared back end for write_input() and write_namelist().
+
+    Arguments:
+        filename (str): output filename
+        text (str): file contents
+        verbose (bool): whether or not to provide diagnostic output
+    """
+
+    # produce diagnotic output
+    if (verbose):
+        print("----------------------------------------------------------------")
+        print("Generating text file %s:" % filename)
+        print(text)
+        print("----------------------------------------------------------------")
+
+    # dump contents to file
+    #   with single write through enlarged buffer
+    with open(filename, "w", buffering=k_write_buffer_size) as data_file:
+        data_file.write(text)
+
+
 def write_input(filename,input_lines=[],verbose=True):
     """ Generate text file (typically an input file for a code to be
     invoked by the script), with contents given line-by-line as list
@@ -87,17 +171,7 @@ def write_input(filename,input_lines=[],verbose=True):
     ##stdin_string = "".join([s + "\n" for s in input_lines])
     stdin_string = "\n".join(input_lines) + "\n"
 
-    # produce diagnotic output
-    if (verbose):
-        print("----------------------------------------------------------------")
-        print("Generating text file %s:" % filename)
-        print(stdin_string)
-        print("----------------------------------------------------------------")
-
-    # dump contents to file
-    data_file = open(filename,"w")
-    data_file.write(stdin_string)
-    data_file.close()
+    _write_text_file(filename, stdin_string, verbose)
 
 
 def write_namelist(filename, input_dict={}, verbose=True):
@@ -105,56 +179,83 @@ def write_namelist(filename, input_dict={}, verbose=True):
 
     Arguments:
         input_dict (dict of dicts): each key names a namelist, with contents given
-            by the inner dictionary
+            by the inner dictionary; list or tuple values are written as arrays
         verbose (bool, optional): whether or not to provide diagnostic output
           (on by default, but might want to suppress, e.g., for large sets
            of files)
     """
-    formatters = {
-        int:   (lambda n: "{:d}".format(n)),
-        float: (lambda x: "{:e}".format(x).replace("e", "d")),
-        bool:  (lambda b: ifelse(b, ".true.", ".false.")),
-        str:   (lambda s: "'{:s}'".format(s)),
-    }
+    # bind formatter lookup locally, for use in loops below
+    get_formatter = k_namelist_formatters.get
 
     def format_val(x):
-        if type(x) not in formatters.keys():
-            raise exception.ScriptError(
-                "{} of type {} cannot be written to namelist".format(x, type(x))
-                )
-        return formatters[type(x)](x)
-
-    lines = []
-
-    for (name, namelist) in input_dict.items():
-        # start Fortran namelist
-        lines.append("&{:s}".format(name))
-        # loop over contents
+        # dispatch on exact type
+        formatter = get_formatter(type(x))
+        if formatter is not None:
+            return formatter(x)
+        # else dispatch on nearest base class (e.g., for subclasses of float)
+        for cls in type(x).__mro__[1:]:
+            formatter = get_formatter(cls)
+            if formatter is not None:
+                return formatter(x)
+        raise exception.ScriptError(
+            "{} of type {} cannot be written to namelist".format(x, type(x))
+            )
+
+    def namelist_entries(namelist):
         for (key, val) in namelist.items():
             # sanity check
-            if type(key) is not str:
+            if not isinstance(key, str):
                 raise exception.ScriptError("invalid namelist variable: {}".format(key))
 
-            # loop over lists and map them to arrays
-            if type(val) is list:
-                for i, item in enumerate(val):
-                    lines.append("{key:s}({i:d}) = {value},".format(key=key, i=i+1, value=format_val(item)))
+            # loop over lists (or tuples) and map them to arrays
+            if isinstance(val, (list, tuple)):
+                # for homogeneous array, look up formatter only once
+                item_types = set(map(type, val))
+                formatter = None
+                if len(item_types) == 1:
+                    formatter = get_formatter(item_types.pop())
+                if formatter is not None:
+                    for i, item in enumerate(val, 1):
+                        yield f"{key}({i}) = {formatter(item)}"
+                else:
+                    for i, item in enumerate(val, 1):
+                        yield f"{key}({i}) = {format_val(item)}"
             # write out scalar variables
             else:
-                lines.append("{key:s} = {value},".format(key=key, value=format_val(val)))
-
-        # trim last comma and add namelist termination
-        lines[-1] = lines[-1].rstrip(',')
-        lines.append("/")
+                yield f"{key} = {format_val(val)}"
+
+    def namelist_lines():
+        for (name, namelist) in input_dict.items():
+            # start Fortran namelist
+            yield f"&{name:s}\n"
+            # comma-separate entries, holding back each entry until it is known
+            # whether another follows
+            previous_entry = None
+            for entry in namelist_entries(namelist):
+                if previous_entry is not None:
+                    yield previous_entry + ",\n"
+                previous_entry = entry
+            if previous_entry is not None:
+                yield previous_entry + "\n"
+            # add namelist termination
+            yield "/\n"
+        # empty file still consists of single newline (as from write_input)
+        if not input_dict:
+            yield "\n"
 
     # write file
-    return write_input(filename, lines, verbose)
+    #   Text is fully assembled before the file is opened, so that a
+    #   formatting failure leaves any existing file untouched.
+    _write_text_file(filename, "".join(namelist_lines()), verbose)
 
 
 ################################################################
 # timestamp utilities
 ################################################################
 
+# time stamp for most recent second, as (seconds since epoch, string)
+_time_stamp_cache = (None, None)
+
 def time_stamp():
     """Returns time stamp string.
 
@@ -162,11 +263,20 @@ def time_stamp():
     keeping it since (a) it saves loading the time module, and (b) it
     allows future flexibility in the preferred logging format.
 
+    The time stamp has one-second resolution, so the formatted string is
+    reused for repeated calls within the same second.
+
     Returns:
         (str): text for use as time stamp
     """
+    global _time_stamp_cache
 
-    return time.asctime()
+    current_time = int(time.time())
+    (cached_time, cached_stamp) = _time_stamp_cache
+    if current_time != cached_time:
+        cached_stamp = time.asctime(time.localtime(current_time))
+        _time_stamp_cache = (current_time, cached_stamp)
+    return cached_stamp
 
 def date_tag():
     """ Returns date tag string "YYMMDD".
@@ -183,7 +293,19 @@ def date_tag():
 def stringify(li,delimiter):
     """ Converts list entries to strings and joins with delimiter."""
 
-    string_list = map(str,li)
+    # fast path: sequence entries are commonly already strings
+    #
+    # Note: Only attempted for list or tuple, since a failed join would
+    # partially consume a general iterable.
+    if isinstance(li, (list, tuple)):
+        try:
+            return delimiter.join(li)
+        except TypeError:
+            pass
+
+    # Note: str.join materializes its argument as a sequence anyway, so
+    # building the list directly is cheaper than passing a map object.
+    string_list = [str(x) for x in li]
     return delimiter.join(string_list)
 
 def dashify(li):
@@ -196,6 +318,8 @@ def spacify(li):
 
     return stringify(li," ")
 
+k_ansi_escape_regex = re.compile(r'(\x9B|\x1B\[)[0-?]*[ -/]*[@-~]')
+
 def scrub_ansi(s):
     """Remove ANSI escape sequences from string
 
@@ -204,8 +328,7 @@ def scrub_ansi(s):
     Returns:
         (str): string without ANSI escape sequences
     """
-    ansi_escape = re.compile(r'(\x9B|\x1B\[)[0-?]*[ -/]*[@-~]')
-    return ansi_escape.sub('', s)
+    return k_ansi_escape_regex.sub('', s)
 
 ################################################################
 # debug message utilities
@@ -230,11 +353,9 @@ def value_range(x1,x2,dx,epsilon=0.00001):
     epsilon: tolerance for cutoff, as fraction of dx
     """
 
-    value_list = []
-    x=x1
-    while (x < (x2 + dx * epsilon)):
-        value_list.append(x)
-        x += dx
+    # count values x1+i*dx satisfying x < x2+dx*epsilon
+    num_values = max(0, math.ceil((x2-x1)/dx + epsilon))
+    value_list = [x1 + i*dx for i in range(num_values)]
     return value_list
 
 def log_range(x1,x2,steps,base=2,power=1,first=True):
@@ -250,9 +371,10 @@ def log_range(x1,x2,steps,base=2,power=1,first=True):
 
     alpha = power**(-1) * math.log(x2/x1) / math.log(base)
 
+    num_values = max(0, math.ceil(alpha*steps + 0.00001))
     value_list = [
-        x1 * base**(power*p)
-        for p in value_range(0,alpha,1/steps)
+        x1 * base**(power*i/steps)
+        for i in range(num_values)
         ]
 
     if (not first):
@@ -286,13 +408,13 @@ def approx_less(x,y,tol):
     """ approx_equal(x,y,tol) tests whether or not x<y excluding values within tolerance tol
     """
 
-    return not approx_gtr_equal(x,y,tol)
+    return not (x >= y-tol)
 
 def approx_gtr(x,y,tol):
     """ approx_equal(x,y,tol) tests whether or not x>y excluding values within tolerance tol
     """
 
-    return not approx_less_equal(x,y,tol)
+    return not (x <= y+tol)
 
 ################################################################
 # default value utility
@@ -321,6 +443,49 @@ def ifelse(cond,a,b):
 # path search utilities
 ################################################################
 
+def _candidate_paths(head, component_lists):
+    """Generate candidate paths for search_in_subdirectories(), depth-first.
+
+    Any directory which does not exist is skipped, along with the entire
+    subtree of candidates beneath it.
+
+    Arguments:
+        head (str or None): path prefix (or None at top level)
+        component_lists (list of list of str): remaining path components
+
+    Yields:
+        (str): candidate path
+    """
+    if len(component_lists) == 1:
+        for filename in component_lists[0]:
+            yield (filename if head is None else os.path.join(head, filename))
+        return
+    for component in component_lists[0]:
+        path = component if head is None else os.path.join(head, component)
+        if not os.path.isdir(path if path else os.curdir):
+            continue
+        yield from _candidate_paths(path, component_lists[1:])
+
+def _path_component_lists(args):
+    """Regularize path arguments for search_in_subdirectories().
+
+    Arguments:
+        args (tuple of (str or list of str)): path segments (or lists of
+            possible values)
+
+    Returns:
+        (list of list of str): lists of possible values for path segments
+    """
+    if len(args) < 2:
+        raise ValueError("not enough arguments:", *args)
+    path_component_lists = []
+    for path_or_list in args:
+        if isinstance(path_or_list, (str,bytes,os.PathLike)):
+            path_component_lists.append([path_or_list])
+        else:
+            path_component_lists.append(list(path_or_list))
+    return path_component_lists
+
 def search_in_subdirectories(
         *args, base=False, fail_on_not_found=True, error_message=None, verbose=True
 ):
@@ -364,45 +529,80 @@ def search_in_subdirectories(
     """
 
     # process arguments
-    if len(args) < 2:
-        raise ValueError("not enough arguments:", *args)
-    path_component_lists = []
-    for path_or_list in args:
-        if isinstance(path_or_list, (str,bytes,os.PathLike)):
-            path_component_lists.append([path_or_list])
-        else:
-            path_component_lists.append(list(path_or_list))
+    path_component_lists = _path_component_lists(args)
 
     if verbose:
-        print("----------------------------------------------------------------")
-        print("Searching for file name...")
-        print("  Base directories:", path_component_lists[0])
+        # assemble diagnostic output for single write
+        log_lines = [
+            "----------------------------------------------------------------",
+            "Searching for file name...",
+            f"  Base directories: {path_component_lists[0]}",
+        ]
         for subdirectory_list in path_component_lists[1:-1]:
-            print("  Subdirectories:", subdirectory_list)
-        print("  Filenames:", path_component_lists[-1])
+            log_lines.append(f"  Subdirectories: {subdirectory_list}")
+        log_lines.append(f"  Filenames: {path_component_lists[-1]}")
+        print("\n".join(log_lines))
+
+    # cache directory listings (as sets of entry names), so that each
+    # directory is read at most once
+    listings = {}
+    def directory_listing(path):
+        if path not in listings:
+            try:
+                with os.scandir(path if path else os.curdir) as entries:
+                    listings[path] = {entry.name for entry in entries}
+            except (FileNotFoundError, NotADirectoryError):
+                listings[path] = frozenset()
+            except OSError:
+                # e.g., directory searchable but not readable
+                listings[path] = None
+        return listings[path]
+
+    # test for filename root in listing of the parent directory
+    def root_exists(qualified_name):
+        (parent, root) = os.path.split(qualified_name)
+        names = directory_listing(parent)
+        return (names is not None) and any(name.startswith(root) for name in names)
+
+    # test for file in listing of the parent directory
+    #
+    # Only a hit is confirmed by stat (e.g., against a broken symbolic link).
+    def file_exists(qualified_name):
+        (parent, name) = os.path.split(qualified_name)
+        if name in ("", os.curdir, os.pardir):
+            return os.path.exists(qualified_name)
+        names = directory_listing(parent)
+        if names is None:
+            return os.path.exists(qualified_name)
+        return (name in names) and os.path.exists(qualified_name)
+
+    # for a single candidate filename per directory, a direct stat is cheaper
+    # than reading the directory
+    if (base):
+        test = root_exists
+    elif len(path_component_lists[-1]) > 1:
+        test = file_exists
+    else:
+        test = os.path.exists
 
     # search in successive directories
     success = False
     qualified_name = None
-    for path_components in itertools.product(*path_component_lists):
-        qualified_name = os.path.join(*path_components)
-        if (base):
-            success = len(glob.glob(qualified_name+"*"))>0
-        else:
-            success = os.path.exists(qualified_name)
+    for qualified_name in _candidate_paths(None, path_component_lists):
+        success = test(qualified_name)
         if (success):
             break
 
     # document success or failure
     if verbose:
         if success:
-            print("  ->", qualified_name)
+            log_line = f"  -> {qualified_name}"
         else:
             if error_message is None:
-                print("  ERROR: No matching filename found...")
+                log_line = "  ERROR: No matching filename found..."
             else:
-                print("  ERROR: {}".format(error_message))
-        print("----------------------------------------------------------------")
+                log_line = "  ERROR: {}".format(error_message)
+        print(log_line, "----------------------------------------------------------------", sep="\n")
 
     # handle return for success or failure
     if (not success):
@@ -413,6 +613,107 @@ def search_in_subdirectories(
     return qualified_name
 
 
+def search_many_in_subdirectories(*args, fail_on_not_found=True, verbose=True):
+    """Search for each of several files in a list of subdirectories, beneath a
+    given base path (or list of base paths).
+
+    Each filename is located independently, as if by a separate call to
+    search_in_subdirectories() (with base=False), but each candidate directory
+    is read only once, for all filenames.
+
+    Example:
+
+        >>> base_path_list = ["/base_path_1", "/base_path_2"],
+        >>> subdirectory_list = ["subdirectory_1", "subdirectory_2"],
+        >>> filenames = ["file_1.txt", "file_2.txt"]
+        >>> search_many_in_subdirectories(base_path_list, subdirectory_list, filenames)
+
+            {
+                "file_1.txt": "/base_path_1/subdirectory_2/file_1.txt",
+                "file_2.txt": "/base_path_2/subdirectory_1/file_2.txt",
+            }
+
+    Arguments:
+
+        path_or_list_1, ... (str or list[str]): path segment (or list of
+            possible values to iteratively search), where the last argument
+            gives the filenames to be located
+
+        fail_on_not_found (bool, optional): whether to raise exception on
+            failure to match any filename (else its result is None)
+
+        verbose (bool, optional): whether to print log messages
+
+    Returns:
+        (dict): mapping from each filename to its first match (or None)
+
+    Raises:
+         mcscript.exception.ScriptError: if no match is found for some filename
+
+    """
+
+    # process arguments
+    path_component_lists = _path_component_lists(args)
+    filenames = path_component_lists[-1]
+
+    if verbose:
+        # assemble diagnostic output for single write
+        log_lines = [
+            "----------------------------------------------------------------",
+            "Searching for file names...",
+            f"  Base directories: {path_component_lists[0]}",
+        ]
+        for subdirectory_list in path_component_lists[1:-1]:
+            log_lines.append(f"  Subdirectories: {subdirectory_list}")
+        log_lines.append(f"  Filenames: {filenames}")
+        print("\n".join(log_lines))
+
+    # search in successive directories, until all filenames are matched
+    results = dict.fromkeys(filenames)
+    remaining_filenames = dict.fromkeys(filenames)
+    for directory in _candidate_paths(None, path_component_lists[:-1]):
+        try:
+            with os.scandir(directory if directory else os.curdir) as entries:
+                names = {entry.name for entry in entries}
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        except OSError:
+            # e.g., directory searchable but not readable
+            names = None
+        for filename in list(remaining_filenames):
+            qualified_name = os.path.join(directory, filename)
+            if (
+                    (names is None)
+                    or (filename in ("", os.curdir, os.pardir))
+                    or (os.path.basename(filename) != filename)
+            ):
+                # filename cannot be found in listing (e.g., includes subdirectory)
+                success = os.path.exists(qualified_name)
+            else:
+                success = (filename in names) and os.path.exists(qualified_name)
+            if (success):
+                results[filename] = qualified_name
+                del remaining_filenames[filename]
+        if not remaining_filenames:
+            break
+
+    # document success or failure
+    if verbose:
+        log_lines = []
+        for filename in filenames:
+            if results[filename] is not None:
+                log_lines.append(f"  -> {results[filename]}")
+            else:
+                log_lines.append("  ERROR: No match for filename {}...".format(filename))
+        log_lines.append("----------------------------------------------------------------")
+        print("\n".join(log_lines))
+
+    # handle failure
+    if remaining_filenames and fail_on_not_found:
+        raise exception.ScriptError(f"no match on filenames {list(remaining_filenames)} in {path_component_lists[0:-1]}")
+    return results
+
+
 def expand_path(path_or_list):
     """Expand and normalize path.
 
@@ -428,6 +729,11 @@ def expand_path(path_or_list):
     """
     if path_or_list is None:
         return None
+    elif isinstance(path_or_list, str) and not (
+            "$" in path_or_list or path_or_list.startswith("~")
+    ):
+        # fast path: no variables or ~ to expand, so just normalize
+        return os.path.normpath(path_or_list)
     elif isinstance(path_or_list, (str, bytes, os.PathLike)):
         expanded_path = os.path.expanduser(os.path.expandvars(path_or_list))
         norm_path = os.path.normpath(expanded_path)
@@ -454,10 +760,12 @@ def dict_union(*args):
     Returns:
        (dict): the result of successively updating an initially-empty
            dictionary with the given arguments
+
+    Note: Requires Python 3.9+ (in-place dictionary merge operator).
     """
-    accumulator = dict()
+    accumulator = {}
     for dictionary in args:
-        accumulator.update(dictionary)
+        accumulator |= dictionary
     return accumulator
 
 ################################################################
@@ -465,27 +773,49 @@ def dict_union(*args):
 ################################################################
 
 def mkdir(dirname, exist_ok=False, parents=False):
-    """Create directory, avoiding use of os.mkdir.
-
-    Note: os.mkdir can apparently cause stability issues with parallel
-    filesystems (at least NERSC CSCRATCH circa 2/17, where it is
-    apparently translated as "lfs mkdir -i"?) and is therefore to be
-    avoided in scripting which might encounter such filesystems.
+    """Create directory.
+
+    Note: os.mkdir was found to cause stability issues with parallel
+    filesystems (at least NERSC CSCRATCH circa 2/17, where it was
+    apparently translated as "lfs mkdir -i"?), so this function
+    historically invoked the mkdir utility as a subprocess instead.  Both
+    make the same mkdir(2) system call, so the directory is now created
+    in-process, avoiding a fork/exec per directory.  If the in-process call
+    fails with an I/O error (EIO), it is retried with the mkdir utility.
+    The subprocess invocation may be restored unconditionally by setting the
+    environment variable MCSCRIPT_LEGACY_MKDIR (to any nonempty value).
 
     Arguments:
         dirname (str): name for directory to create
+        exist_ok (bool): do not raise exception if directory already exists
         parents (bool): make parent directories as necessary
     """
-    if os.path.exists(dirname):
-        if exist_ok:
-            return
-        else:
-            raise FileExistsError(dirname)
-
     if parents:
-        subprocess.call(["mkdir", "--parents", dirname])
+        mkdir_command = ["mkdir", "--parents", dirname]
     else:
-        subprocess.call(["mkdir", dirname])
+        mkdir_command = ["mkdir", dirname]
+
+    if os.environ.get("MCSCRIPT_LEGACY_MKDIR"):
+        if os.path.exists(dirname):
+            if exist_ok:
+                return
+            else:
+                raise FileExistsError(dirname)
+        subprocess.call(mkdir_command)
+        return
+
+    try:
+        if parents:
+            os.makedirs(dirname)
+        else:
+            os.mkdir(dirname)
+    except FileExistsError:
+        if not exist_ok:
+            raise
+    except OSError as err:
+        if err.errno != errno.EIO:
+            raise
+        subprocess.call(mkdir_command)
 
 def get_directory_size(dirname):
     """Get total size of directory in bytes, like `du`.
@@ -525,19 +855,26 @@ def is_compressible(filename, min_size=1048576, min_ratio=1.5):
         return False
 
     # test 4KB from 100 locations within the file for compressibility
-    skip_size = uncompressed_size//100 - 4096
-    compressor = zlib.compressobj()
-    uncompressed_sample_size = 0
-    compressed_sample_size = 0
+    #
+    # Note: discard first 2KB as potential header info
+    stride = uncompressed_size//100
+    offsets = [2048 + i*stride for i in range(100)]
+    sample = bytearray()
     with open(filename, 'rb') as fp:
-        # discard first 2KB as potential header info
-        fp.seek(2048, 1)
-        for i in range(100):
-            uncompressed_block = fp.read(4096)
-            compressed_block = compressor.compress(uncompressed_block)
-            uncompressed_sample_size = uncompressed_sample_size + len(uncompressed_block)
-            compressed_sample_size = compressed_sample_size + len(compressed_block)
-            fp.seek(skip_size, 1)
+        fd = fp.fileno()
+        # advise kernel against readahead between sparse blocks
+        #   (advisory only, so ignore filesystems which reject it)
+        if hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_RANDOM)
+            except OSError:
+                pass
+        for offset in offsets:
+            sample += os.pread(fd, 4096, offset)
+
+    # compress concatenated sample in one pass
+    uncompressed_sample_size = len(sample)
+    compressed_sample_size = len(zlib.compress(sample))
 
     if (uncompressed_sample_size/compressed_sample_size) < min_ratio:
         return False
@@ -554,14 +891,18 @@ def topological_sort(
 ):
     """Topologically sort a directed graph using depth-first traversal.
 
+    The traversal is carried out iteratively, with an explicit stack, so deep
+    graphs are not limited by the interpreter recursion limit.
+
     Arguments:
         graph (dict): graph with keys representing vertices and values
             as lists of edges
         initial_vertices (list, optional): starting vertices for depth-first
             traversal; defaults to all vertices
-        sorted_vertices (list): internal list, used for recursion on intermediate
-            sorted list
-        current_path (list): internal list, used for detection of cycles
+        sorted_vertices (list, optional): previously-sorted vertices, which
+            will not be traversed again
+        current_path (list, optional): vertices to treat as being on the
+            current traversal path, for detection of cycles
 
     Returns:
         (collections.deque): topologically-sorted list of items out-connected
@@ -583,25 +924,36 @@ def topological_sort(
     if current_path is None:
         current_path = []
     sorted_vertices = collections.deque(sorted_vertices)
-    for vertex in sorted(initial_vertices):
-        if vertex in sorted_vertices:
-            continue
-        if vertex in current_path:
-            raise ValueError("graph is not directed-acyclic")
-        current_path.append(vertex)
-        try:
-            child_vertices = graph[vertex]
-        except KeyError:
-            print(graph)
-            raise
-        sorted_vertices = topological_sort(
-            graph,
-            initial_vertices=child_vertices,
-            sorted_vertices=sorted_vertices,
-            current_path=current_path
-        )
-        current_path.pop()
-        sorted_vertices.appendleft(vertex)
+    visited = set(sorted_vertices)
+    path_set = set(current_path)
+
+    # stack of (vertex, iterator over remaining children), with the initial
+    # vertices as children of the bottom (root) entry
+    stack = [(None, iter(sorted(initial_vertices)))]
+    while stack:
+        (vertex, children) = stack[-1]
+        for child in children:
+            if child in visited:
+                continue
+            if child in path_set:
+                raise ValueError("graph is not directed-acyclic")
+            try:
+                child_vertices = graph[child]
+            except KeyError:
+                print(graph)
+                raise
+            current_path.append(child)
+            path_set.add(child)
+            stack.append((child, iter(sorted(child_vertices))))
+            break
+        else:
+            # all children exhausted -- vertex is finished
+            stack.pop()
+            if stack:
+                current_path.pop()
+                path_set.remove(vertex)
+                visited.add(vertex)
+                sorted_vertices.appendleft(vertex)
     return sorted_vertices
 
 ################################################################
@@ -616,7 +968,9 @@ class TaskTimer(object):
         end_time (float): time when remaining time has expired
         safety_factor (float): safety margin for required time
         minimum_time (float): minimum number of seconds for required time
-        timings (list of float): elapsed time for past timings
+        timings (list of float): elapsed time for past timings (should only be
+            appended to by stop_timer(), which also updates the accumulated
+            statistics)
 
     Member attributes:
         received_exit_signal (bool): flag which is set to true when the program
@@ -649,6 +1003,11 @@ class TaskTimer(object):
         self.timings = []
         self._task_start_time = None
 
+        # accumulated statistics over timings
+        self._total_time = 0.
+        self._max_time = 0.
+        self._min_time = math.inf
+
     @property
     def elapsed_time(self):
         """Time (in seconds) since timer was instantiated."""
@@ -671,28 +1030,30 @@ class TaskTimer(object):
         """Average time (in seconds) of past timings."""
         if len(self.timings) == 0:
             return 0.
-        return sum(self.timings)/len(self.timings)
+        return self._total_time/len(self.timings)
 
     @property
     def max_time(self):
         """Maximum time (in seconds) for past timings."""
         if len(self.timings) == 0:
             return 0.
-        return max(self.timings)
+        return self._max_time
 
     @property
     def min_time(self):
         """Minimum time (in seconds) for past timings."""
         if len(self.timings) == 0:
             return 0.
-        return min(self.timings)
+        return self._min_time
 
     @property
     def required_time(self):
         """Estimated time (in seconds) for next timing."""
+        if len(self.timings) == 0:
+            return self.minimum_time
+        average_time = self._total_time/len(self.timings)
         return max(
-            self.average_time*self.safety_factor,
-            self.last_time*self.safety_factor,
+            max(average_time, self.timings[-1])*self.safety_factor,
             self.minimum_time
             )
 
@@ -703,8 +1064,9 @@ class TaskTimer(object):
             (mcscript.exception.InsufficientTime): required time is greater than remaining time
             (RuntimeError): timer already running
         """
-        if (self.required_time > self.remaining_time) or self.received_exit_signal:
-            raise exception.InsufficientTime(self.required_time)
+        required_time = self.required_time
+        if (required_time > self.remaining_time) or self.received_exit_signal:
+            raise exception.InsufficientTime(required_time)
 
         if self._task_start_time is not None:
             raise RuntimeError("timer already started")
@@ -734,6 +1096,9 @@ class TaskTimer(object):
             raise RuntimeError("timer not running")
         task_time = time.time() - self._task_start_time
         self.timings.append(task_time)
+        self._total_time += task_time
+        self._max_time = max(self._max_time, task_time)
+        self._min_time = min(self._min_time, task_time)
         self._task_start_time = None
         return task_time
 
@@ -764,21 +1129,98 @@ def dot(a,b):
     """
     return sum(map((lambda x,y:x*y),a,b))
 
-class CoefficientDict(collections.UserDict):
+# built-in numeric types, tested before falling back on (slower) abstract base
+# class numbers.Number
+k_builtin_number_types = (int, float, complex)
+
+class CoefficientDict(dict):
     """An extended dictionary which represents the coefficients of an algebraic
     expression.
+
+    Note: Subclasses dict directly (rather than collections.UserDict), so that
+    lookups and iteration go through the built-in dict methods.  Since the
+    built-in dict constructor, update(), and merge operators (|, |=) bypass
+    __setitem__, these are overridden to enforce that only nonzero numeric
+    coefficients are stored.
     """
     def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+        super().__init__()
+        self.update(*args, **kwargs)
 
     def __setitem__(self, key, value):
-        if not isinstance(value, numbers.Number):
+        if not (isinstance(value, k_builtin_number_types) or isinstance(value, numbers.Number)):
             raise ValueError("non-numeric coefficient: {}".format(value))
         elif value == 0. or value == 0:
             self.pop(key, 0)
         else:
             super().__setitem__(key, value)
 
+    def update(self, *args, **kwargs):
+        """Update coefficients, enforcing coefficient checks as in __setitem__.
+        """
+        for (key, value) in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key, default=0):
+        """Get coefficient, setting to default if missing.
+        """
+        if key not in self:
+            self[key] = default
+        return self.get(key, default)
+
+    def copy(self):
+        """Return shallow copy, as CoefficientDict.
+        """
+        out = CoefficientDict()
+        dict.update(out, self)
+        return out
+
+    def __or__(self, rhs):
+        """Merge coefficients, enforcing coefficient checks as in __setitem__.
+
+        Coefficients from rhs replace those of self, as for dict, but a zero
+        coefficient removes the key, and a non-numeric coefficient raises
+        ValueError.  The result is a CoefficientDict.
+
+        Examples:
+
+            >>> CoefficientDict(a=1, b=2) | {"b": 0, "c": 3}
+            {'a': 1, 'c': 3}
+            >>> type({"a": 1} | CoefficientDict(b=2)).__name__
+            'CoefficientDict'
+            >>> CoefficientDict(a=1) | {"b": "x"}
+            Traceback (most recent call last):
+                ...
+            ValueError: non-numeric coefficient: x
+        """
+        if not isinstance(rhs, dict):
+            return NotImplemented
+        out = self.copy()
+        out.update(rhs)
+        return out
+
+    def __ror__(self, lhs):
+        """Merge coefficients into left operand, as for __or__.
+        """
+        if not isinstance(lhs, dict):
+            return NotImplemented
+        out = CoefficientDict(lhs)
+        out.update(self)
+        return out
+
+    def __ior__(self, rhs):
+        """Merge coefficients in place, as for update().
+
+        Examples:
+
+            >>> c = CoefficientDict(a=1, b=2)
+            >>> c |= [("a", 0), ("c", 3)]
+            >>> c
+            {'b': 2, 'c': 3}
+        """
+        self.update(rhs)
+        return self
+
     def __add__(self, rhs):
         """Add two CoefficientDicts, matching coefficients.
         """
@@ -788,16 +1230,23 @@ class CoefficientDict(collections.UserDict):
         #
         if not isinstance(rhs, CoefficientDict):
             raise TypeError("unsupported operand type(s) for +: 'CoefficientDict' and "+type_as_str(rhs))
-        out = CoefficientDict()
-        # add keys appearing in both dictionaries
-        for key in (self.keys() & rhs.keys()):
-            out[key] = self[key] + rhs[key]
-        # copy keys appearing only on left side
-        for key in (self.keys() - rhs.keys()):
-            out[key] = self[key]
-        # copy keys appearing only on right side
-        for key in (rhs.keys() - self.keys()):
-            out[key] = rhs[key]
+        # Note: Use built-in dict methods directly, bypassing the checks in
+        # __setitem__ and update().  Both operands already hold only nonzero
+        # numeric coefficients, so only cancellation to zero needs to be
+        # checked.
+        out = self.copy()
+        # accumulate right side
+        #   with bound methods hoisted out of loop
+        get = out.get
+        pop = out.pop
+        set_item = super(CoefficientDict, out).__setitem__
+        for (key, value) in rhs.items():
+            current = get(key)
+            total = value if current is None else current + value
+            if total == 0:
+                pop(key, None)
+            else:
+                set_item(key, total)
         return out
 
     def __radd__(self, lhs):
@@ -810,31 +1259,53 @@ class CoefficientDict(collections.UserDict):
     def __mul__(self, rhs):
         """Scalar multiply by a number.
         """
-        if not (isinstance(rhs, numbers.Number)):
+        if not (isinstance(rhs, k_builtin_number_types) or isinstance(rhs, numbers.Number)):
             raise TypeError("unsupported operand type(s) for *: 'CoefficientDict' and "+type_as_str(rhs))
         out = CoefficientDict()
         # return empty dict if multiplied by zero
         if rhs == 0:
             return out
-        for key in self.keys():
-            out[key] = self[key] * rhs
+        # Note: Use built-in dict methods directly, bypassing __setitem__ (see
+        # __add__).  A product can still vanish by floating-point underflow, so
+        # zeros are filtered.
+        dict.update(out, {
+            key: product
+            for (key, value) in self.items()
+            if (product := value*rhs) != 0
+        })
         return out
 
     def __sub__(self, rhs):
         """Subtract two CoefficientDicts, matching coefficients.
 
-        Note: equivalent to self + (-1)*rhs.
+        Note: equivalent to self + (-1)*rhs, but without constructing the
+        intermediate (-1)*rhs.
         """
         if not isinstance(rhs, CoefficientDict):
             raise TypeError("unsupported operand type(s) for -: 'CoefficientDict' and "+type_as_str(rhs))
-        return self + (-1)*rhs
+        # Note: Use built-in dict methods directly, bypassing __setitem__ (see
+        # __add__).
+        out = self.copy()
+        # accumulate right side
+        #   with bound methods hoisted out of loop
+        get = out.get
+        pop = out.pop
+        set_item = super(CoefficientDict, out).__setitem__
+        for (key, value) in rhs.items():
+            current = get(key)
+            total = -value if current is None else current - value
+            if total == 0:
+                pop(key, None)
+            else:
+                set_item(key, total)
+        return out
 
     def __rmul__(self, lhs):
         """Left scalar multiply by a number.
 
         Note: equivalent to self*lhs since scalar multiplication is commutative.
         """
-        if not (isinstance(lhs, numbers.Number)):
+        if not (isinstance(lhs, k_builtin_number_types) or isinstance(lhs, numbers.Number)):
             raise TypeError("unsupported operand type(s) for *: "+type_as_str(lhs)+" and 'CoefficientDict'")
         return (self * lhs)
 
@@ -843,7 +1314,7 @@ class CoefficientDict(collections.UserDict):
 
         Note: equivalent to self*(1/rhs).
         """
-        if not (isinstance(rhs, numbers.Number)):
+        if not (isinstance(rhs, k_builtin_number_types) or isinstance(rhs, numbers.Number)):
             raise TypeError("unsupported operand type(s) for /: 'CoefficientDict' and "+type_as_str(rhs))
         return self * (1/rhs)
 
@@ -852,6 +1323,6 @@ class CoefficientDict(collections.UserDict):
 
         Note: equivalent to self*(1//rhs).
         """
-        if not (isinstance(rhs, numbers.Number)):
+        if not (isinstance(rhs, k_builtin_number_types) or isinstance(rhs, numbers.Number)):
             raise TypeError("unsupported operand type(s) for //: 'CoefficientDict' and "+type_as_str(rhs))
         return self * (1//rhs)